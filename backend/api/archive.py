@@ -0,0 +1,42 @@
+# backend/api/archive.py
+import hashlib
+import zlib
+from datetime import date, datetime
+from sqlalchemy.orm import Session
+from .models import RawBlob, RawImport
+
+# Archive des dumps bruts gmbr/gexp : compressés, adressés par contenu (sha256),
+# indexés par (family, snapshot_date). Sert à rejouer les imports (scripts/replay_archive.py).
+
+
+def decompress(data: bytes) -> str:
+    return zlib.decompress(data).decode("utf-8")
+
+
+def store_blob(db: Session, text: str) -> str:
+    raw = text.encode("utf-8")
+    sha = hashlib.sha256(raw).hexdigest()
+    if db.get(RawBlob, sha) is None:
+        db.add(RawBlob(sha256=sha, size=len(raw), data=zlib.compress(raw, 9)))
+    return sha
+
+
+def store_import(db: Session, family: str, snapshot_date: date, imported_at: datetime, gmbr: str, gexp: str):
+    gmbr_sha = store_blob(db, gmbr)
+    # autoflush=False : db.get ne voit pas le blob gmbr pas encore flushé
+    gexp_sha = gmbr_sha if gexp == gmbr else store_blob(db, gexp)
+    db.flush()
+
+    # même logique que weekly_points : réimporter un snapshot remplace l'entrée
+    entry = (
+        db.query(RawImport)
+        .filter(RawImport.family == family, RawImport.snapshot_date == snapshot_date)
+        .first()
+    )
+    if entry is None:
+        entry = RawImport(family=family, snapshot_date=snapshot_date)
+        db.add(entry)
+    entry.imported_at = imported_at
+    entry.gmbr_sha256 = gmbr_sha
+    entry.gexp_sha256 = gexp_sha
+    return entry
@@ -0,0 +1,141 @@
+# backend/api/crud.py
+from datetime import date, timedelta
+from collections import defaultdict
+from sqlalchemy.orm import Session
+from sqlalchemy import desc, func, distinct
+
+from .models import Member, WeeklyPoints
+
+# Vues publiques partagées par l'API (main.py) et la publication statique (publish.py)
+
+def get_latest(db: Session, family: str):
+    latest_date = (
+        db.query(func.max(WeeklyPoints.snapshot_date))
+        .filter(WeeklyPoints.family == family)
+        .scalar()
+    )
+    if not latest_date:
+        return []
+
+    rows = (
+        db.query(
+            Member.player_id,
+            Member.nickname,
+            Member.level,
+            Member.class_id,
+            WeeklyPoints.gexp_points,
+            WeeklyPoints.snapshot_date,
+            WeeklyPoints.imported_at,
+        )
+        .join(WeeklyPoints, WeeklyPoints.player_id == Member.player_id)
+        .filter(WeeklyPoints.family == family)
+        .filter(WeeklyPoints.snapshot_date == latest_date)
+        .order_by(desc(WeeklyPoints.gexp_points))
+        .all()
+    )
+
+    return [
+        {
+            "player_id": r[0],
+            "nickname": r[1],
+            "level": r[2],
+            "class_id": r[3],
+            "gexp_points": int(r[4]),
+            "snapshot_date": r[5].isoformat() if r[5] else None,
+            "imported_at": r[6].isoformat() if r[6] else None,
+        }
+        for r in rows
+    ]
+
+def get_snapshots(db: Session, family: str):
+    rows = (
+        db.query(distinct(WeeklyPoints.snapshot_date))
+        .filter(WeeklyPoints.family == family)
+        .order_by(WeeklyPoints.snapshot_date)
+        .all()
+    )
+    return [r[0].isoformat() for r in rows]
+
+def get_history(db: Session, family: str, from_date: date, to_date: date):
+    rows_dates = (
+        db.query(distinct(WeeklyPoints.snapshot_date))
+        .filter(
+            WeeklyPoints.family == family,
+            WeeklyPoints.snapshot_date.between(from_date, to_date),
+        )
+        .order_by(WeeklyPoints.snapshot_date)
+        .all()
+    )
+    dates = [d[0] for d in rows_dates]
+
+    members = db.query(Member).filter(Member.family == family).all()
+
+    rows = (
+        db.query(
+            WeeklyPoints.player_id,
+            WeeklyPoints.snapshot_date,
+            WeeklyPoints.gexp_points,
+        )
+        .filter(
+            WeeklyPoints.family == family,
+            WeeklyPoints.snapshot_date.between(from_date, to_date),
+        )
+        .all()
+    )
+
+    points_map = defaultdict(dict)
+    for pid, snap, pts in rows:
+        points_map[pid][snap] = int(pts)
+
+    last_date = dates[-1] if dates else None
+    prev_date = dates[-2] if len(dates) >= 2 else None
+
+    monthly_ref = None
+    if last_date:
+        target = last_date - timedelta(days=30)
+        candidates = [d for d in dates if d <= target]
+        if candidates:
+            monthly_ref = candidates[-1]
+
+    result = []
+
+    for m in members:
+        player_points = {}
+        for d in dates:
+            player_points[d.isoformat()] = int(points_map.get(m.player_id, {}).get(d, 0))
+
+        last_val = int(points_map.get(m.player_id, {}).get(last_date, 0)) if last_date else 0
+
+        period_diff = None
+        if dates:
+            first_val = int(points_map.get(m.player_id, {}).get(dates[0], 0))
+            period_diff = last_val - first_val
+
+        weekly_diff = None
+        if last_date and prev_date:
+            weekly_diff = int(points_map.get(m.player_id, {}).get(last_date, 0)) - int(
+                points_map.get(m.player_id, {}).get(prev_date, 0)
+            )
+
+        monthly_diff = None
+        if last_date and monthly_ref:
+            monthly_diff = int(points_map.get(m.player_id, {}).get(last_date, 0)) - int(
+                points_map.get(m.player_id, {}).get(monthly_ref, 0)
+            )
+
+        result.append(
+            {
+                "player_id": m.player_id,
+                "nickname": m.nickname,
+                "level": m.level,
+                "class_id": m.class_id,
+                "points": player_points,
+                "last_value": last_val,
+                "period_diff": period_diff,
+                "weekly_diff": weekly_diff,
+                "monthly_diff": monthly_diff,
+                "monthly_ref": monthly_ref.isoformat() if monthly_ref else None,
+            }
+        )
+
+    return {"dates": [d.isoformat() for d in dates], "players": result}
@@ -3,9 +3,9 @@ from datetime import date, datetime
 from typing import Optional
 from sqlalchemy.orm import Session
 from .models import Member, WeeklyPoints
+from .archive import store_import
 
-def import_files(db: Session, gmbr: str, gexp: str, family: str, snapshot_date: Optional[date] = None):
-    # gmbr
+def parse_gmbr(gmbr: str, family: str) -> dict:
     if gmbr.startswith("gmbr"):
         gmbr = gmbr[4:].strip()
 
@@ -22,7 +22,24 @@ def import_files(db: Session, gmbr: str, gexp: str, family: str, snapshot_date:
             "class_id": int(p[4]),
             "family": family,
         }
+    return members
+
+def parse_gexp(gexp: str, members: dict) -> dict:
+    if gexp.startswith("gexp"):
+        gexp = gexp[4:].strip()
 
+    points = {}
+    for entry in gexp.split():
+        p = entry.split("|")
+        if len(p) != 2:
+            continue
+        pid, pts = int(p[0]), int(p[1])
+        if pid not in members:
+            continue
+        points[pid] = pts
+    return points
+
+def apply_snapshot(db: Session, members: dict, points: dict, family: str, snap: date, imported_at: datetime):
     # upsert members
     for m in members.values():
         existing = db.get(Member, m["player_id"])
@@ -32,35 +49,32 @@ def import_files(db: Session, gmbr: str, gexp: str, family: str, snapshot_date:
         else:
             db.add(Member(**m))
 
-    # gexp
-    if gexp.startswith("gexp"):
-        gexp = gexp[4:].strip()
-
-    snap = snapshot_date or date.today()
-    imported_at = datetime.utcnow()
-
     # ✅ IMPORTANT: replace snapshot -> pas de doublons si tu réimportes
     db.query(WeeklyPoints).filter(
         WeeklyPoints.family == family,
         WeeklyPoints.snapshot_date == snap,
     ).delete(synchronize_session=False)
 
-    for entry in gexp.split():
-        p = entry.split("|")
-        if len(p) != 2:
-            continue
-        pid, points = int(p[0]), int(p[1])
-        if pid not in members:
-            continue
-
+    for pid, pts in points.items():
         db.add(
             WeeklyPoints(
                 snapshot_date=snap,
                 imported_at=imported_at,
                 family=family,
                 player_id=pid,
-                gexp_points=points,
+                gexp_points=pts,
             )
         )
 
-    db.commit()
\ No newline at end of file
+def import_files(db: Session, gmbr: str, gexp: str, family: str, snapshot_date: Optional[date] = None):
+    snap = snapshot_date or date.today()
+    imported_at = datetime.utcnow()
+
+    # dump brut archivé tel quel (champs gmbr non exploités inclus) -> rejouable
+    store_import(db, family, snap, imported_at, gmbr, gexp)
+
+    members = parse_gmbr(gmbr, family)
+    points = parse_gexp(gexp, members)
+    apply_snapshot(db, members, points, family, snap, imported_at)
+
+    db.commit()
@@ -1,12 +1,13 @@
 # backend/api/main.py
 from fastapi import FastAPI, Depends, UploadFile, File, Query, Form, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import OperationalError
-from sqlalchemy import desc, func, distinct
+from sqlalchemy import func, distinct
 from typing import Optional
 from datetime import datetime, date, timedelta
-from collections import defaultdict
+import os
 import time
 from pydantic import BaseModel
 from fastapi import Body
@@ -14,6 +15,8 @@ from fastapi import Body
 from .db import engine, get_db
 from .models import Base, Member, WeeklyPoints
 from .importer import import_files
+from .singleflight import SingleFlight, SingleFlightTimeout
+from . import crud, publish
 
 from .auth import authenticate_user, create_access_token, get_current_user, require_roles
 
@@ -73,60 +76,35 @@ async def import_family(
     if snapshot_date:
         snap = datetime.strptime(snapshot_date, "%Y-%m-%d").date()
 
-    import_files(db, gmbr_txt, gexp_txt, family, snapshot_date=snap)
+    # parsing, archive (sha256, zlib), requêtes, écritures disque : hors de la boucle d'événements
+    await run_in_threadpool(import_files, db, gmbr_txt, gexp_txt, family, snapshot_date=snap)
+    await run_in_threadpool(publish.publish_views, db, family)
     return {"status": "imported", "family": family, "snapshot_date": (snap.isoformat() if snap else None)}
 
 # ---------------- PUBLIC API ----------------
 
-@app.get("/family/{family}/latest")
-def latest(family: str, db: Session = Depends(get_db)):
-    latest_date = (
-        db.query(func.max(WeeklyPoints.snapshot_date))
-        .filter(WeeklyPoints.family == family)
-        .scalar()
-    )
-    if not latest_date:
-        return []
+# Requêtes identiques simultanées (ex: tout le monde ouvre le dashboard après un import)
+# -> un seul calcul, résultat partagé
+_flight = SingleFlight(passthrough=(HTTPException,))
 
-    rows = (
-        db.query(
-            Member.player_id,
-            Member.nickname,
-            Member.level,
-            Member.class_id,
-            WeeklyPoints.gexp_points,
-            WeeklyPoints.snapshot_date,
-            WeeklyPoints.imported_at,
-        )
-        .join(WeeklyPoints, WeeklyPoints.player_id == Member.player_id)
-        .filter(WeeklyPoints.family == family)
-        .filter(WeeklyPoints.snapshot_date == latest_date)
-        .order_by(desc(WeeklyPoints.gexp_points))
-        .all()
-    )
+# attente max (s) d'une requête identique par type de clé : history est le calcul le plus lourd
+LATEST_TIMEOUT = float(os.getenv("SINGLEFLIGHT_LATEST_TIMEOUT", "10"))
+HISTORY_TIMEOUT = float(os.getenv("SINGLEFLIGHT_HISTORY_TIMEOUT", "60"))
+PLAYER_TIMEOUT = float(os.getenv("SINGLEFLIGHT_PLAYER_TIMEOUT", "20"))
 
-    return [
-        {
-            "player_id": r[0],
-            "nickname": r[1],
-            "level": r[2],
-            "class_id": r[3],
-            "gexp_points": int(r[4]),
-            "snapshot_date": r[5].isoformat() if r[5] else None,
-            "imported_at": r[6].isoformat() if r[6] else None,
-        }
-        for r in rows
-    ]
+def _coalesce(key, fn, timeout):
+    try:
+        return _flight.do(key, fn, timeout=timeout)
+    except SingleFlightTimeout:
+        raise HTTPException(status_code=503, detail="Computation timed out, retry later")
+
+@app.get("/family/{family}/latest")
+def latest(family: str, db: Session = Depends(get_db)):
+    return _coalesce(("latest", family), lambda: crud.get_latest(db, family), LATEST_TIMEOUT)
 
 @app.get("/family/{family}/snapshots")
 def list_snapshots(family: str, db: Session = Depends(get_db)):
-    rows = (
-        db.query(distinct(WeeklyPoints.snapshot_date))
-        .filter(WeeklyPoints.family == family)
-        .order_by(WeeklyPoints.snapshot_date)
-        .all()
-    )
-    return [r[0].isoformat() for r in rows]
+    return crud.get_snapshots(db, family)
 
 @app.get("/family/{family}/history")
 def history(
@@ -135,97 +113,13 @@ def history(
     to_date: date,
     db: Session = Depends(get_db),
 ):
-    rows_dates = (
-        db.query(distinct(WeeklyPoints.snapshot_date))
-        .filter(
-            WeeklyPoints.family == family,
-            WeeklyPoints.snapshot_date.between(from_date, to_date),
-        )
-        .order_by(WeeklyPoints.snapshot_date)
-        .all()
-    )
-    dates = [d[0] for d in rows_dates]
-
-    members = db.query(Member).filter(Member.family == family).all()
-
-    rows = (
-        db.query(
-            WeeklyPoints.player_id,
-            WeeklyPoints.snapshot_date,
-            WeeklyPoints.gexp_points,
-        )
-        .filter(
-            WeeklyPoints.family == family,
-            WeeklyPoints.snapshot_date.between(from_date, to_date),
-        )
-        .all()
+    return _coalesce(
+        ("history", family, from_date, to_date),
+        lambda: crud.get_history(db, family, from_date, to_date),
+        HISTORY_TIMEOUT,
     )
 
-    points_map = defaultdict(dict)
-    for pid, snap, pts in rows:
-        points_map[pid][snap] = int(pts)
-
-    last_date = dates[-1] if dates else None
-    prev_date = dates[-2] if len(dates) >= 2 else None
-
-    monthly_ref = None
-    if last_date:
-        target = last_date - timedelta(days=30)
-        candidates = [d for d in dates if d <= target]
-        if candidates:
-            monthly_ref = candidates[-1]
-
-    result = []
-
-    for m in members:
-        player_points = {}
-        for d in dates:
-            player_points[d.isoformat()] = int(points_map.get(m.player_id, {}).get(d, 0))
-
-        last_val = int(points_map.get(m.player_id, {}).get(last_date, 0)) if last_date else 0
-
-        period_diff = None
-        if dates:
-            first_val = int(points_map.get(m.player_id, {}).get(dates[0], 0))
-            period_diff = last_val - first_val
-
-        weekly_diff = None
-        if last_date and prev_date:
-            weekly_diff = int(points_map.get(m.player_id, {}).get(last_date, 0)) - int(
-                points_map.get(m.player_id, {}).get(prev_date, 0)
-            )
-
-        monthly_diff = None
-        if last_date and monthly_ref:
-            monthly_diff = int(points_map.get(m.player_id, {}).get(last_date, 0)) - int(
-                points_map.get(m.player_id, {}).get(monthly_ref, 0)
-            )
-
-        result.append(
-            {
-                "player_id": m.player_id,
-                "nickname": m.nickname,
-                "level": m.level,
-                "class_id": m.class_id,
-                "points": player_points,
-                "last_value": last_val,
-                "period_diff": period_diff,
-                "weekly_diff": weekly_diff,
-                "monthly_diff": monthly_diff,
-                "monthly_ref": monthly_ref.isoformat() if monthly_ref else None,
-            }
-        )
-
-    return {"dates": [d.isoformat() for d in dates], "players": result}
-
-@app.get("/family/{family}/player/by-nickname/{nickname}")
-def get_player_by_nickname(
-    family: str,
-    nickname: str,
-    from_date: date,
-    to_date: date,
-    db: Session = Depends(get_db),
-):
+def _player_by_nickname(db: Session, family: str, nickname: str, from_date: date, to_date: date):
     player = (
         db.query(Member)
         .filter(
@@ -307,7 +201,21 @@ def get_player_by_nickname(
             "monthly_ref": monthly_ref.isoformat() if monthly_ref else None,
         },
     }
-    
+
+@app.get("/family/{family}/player/by-nickname/{nickname}")
+def get_player_by_nickname(
+    family: str,
+    nickname: str,
+    from_date: date,
+    to_date: date,
+    db: Session = Depends(get_db),
+):
+    return _coalesce(
+        ("player", family, nickname.lower(), from_date, to_date),
+        lambda: _player_by_nickname(db, family, nickname, from_date, to_date),
+        PLAYER_TIMEOUT,
+    )
+
 class NicknameUpdate(BaseModel):
     nickname: str
 
@@ -352,6 +260,7 @@ def update_nickname(
     m.nickname = new_nick
     db.commit()
     db.refresh(m)
+    publish.publish_views(db, family)
 
     return {
         "player_id": m.player_id,
@@ -1,5 +1,5 @@
 # backend/api/models.py
-from sqlalchemy import Column, BigInteger, Integer, String, Date, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, BigInteger, Integer, String, Date, DateTime, ForeignKey, UniqueConstraint, LargeBinary, Index
 from sqlalchemy.orm import declarative_base, relationship
 from datetime import datetime
 
@@ -37,4 +37,30 @@ class WeeklyPoints(Base):
 
     __table_args__ = (
         UniqueConstraint("snapshot_date", "family", "player_id", name="uq_snapshot_player"),
-    )
\ No newline at end of file
+    )
+
+
+class RawBlob(Base):
+    __tablename__ = "raw_blobs"
+
+    sha256 = Column(String(64), primary_key=True)            # hash du texte brut (non compressé)
+    size = Column(BigInteger, nullable=False)                # taille brute en octets
+    data = Column(LargeBinary, nullable=False)               # texte brut compressé (zlib)
+
+
+class RawImport(Base):
+    __tablename__ = "raw_imports"
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+
+    family = Column(String(64), nullable=False)
+    snapshot_date = Column(Date, nullable=False)
+    imported_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    gmbr_sha256 = Column(String(64), ForeignKey("raw_blobs.sha256"), nullable=False)
+    gexp_sha256 = Column(String(64), ForeignKey("raw_blobs.sha256"), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("family", "snapshot_date", name="uq_raw_import_snapshot"),
+        Index("ix_raw_imports_snapshot", "snapshot_date"),
+    )
@@ -0,0 +1,137 @@
+# backend/api/publish.py
+import gzip
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from datetime import date, datetime
+from typing import Any, Dict
+
+from sqlalchemy.orm import Session
+
+from . import crud
+
+logger = logging.getLogger(__name__)
+
+# Dossier partagé avec le conteneur nginx du frontend (vide = publication désactivée)
+STATIC_DIR = os.getenv("STATIC_DIR", "")
+# Versions gardées par famille (la précédente reste servie aux clients en cours de chargement)
+KEEP_VERSIONS = 2
+
+# Layout:
+#   STATIC_DIR/<family>/manifest.json          -> {"version": ..., "files": {"latest": "<version>/latest.json", ...}}
+#   STATIC_DIR/<family>/<version>/<view>.json  (+ .json.gz, servi par nginx via gzip_static)
+
+
+def _write_atomic(path: str, data: bytes):
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _check_family(family: str):
+    # nom brut sur disque : nginx décode l'URL (encodeURIComponent côté frontend)
+    if not family or family.startswith(".") or "/" in family or "\\" in family or "\0" in family:
+        raise ValueError(f"Invalid family name: {family!r}")
+
+
+def publish_views(db: Session, family: str):
+    # Vues publiques par défaut pré-calculées (import, renommage, replay).
+    # Les données sont déjà commitées : un échec ici ne doit pas faire échouer l'appelant,
+    # mais le manifest est retiré pour que le frontend retombe sur l'API (données fraîches).
+    if not STATIC_DIR:
+        return
+    try:
+        snapshots = crud.get_snapshots(db, family)
+        views = {
+            "latest": crud.get_latest(db, family),
+            "snapshots": snapshots,
+        }
+        meta = {}
+        if snapshots:
+            # plage par défaut de HistoryDashboard.jsx : premier -> dernier snapshot
+            from_date = date.fromisoformat(snapshots[0])
+            to_date = date.fromisoformat(snapshots[-1])
+            views["history"] = crud.get_history(db, family, from_date, to_date)
+            meta["history_range"] = {"from_date": snapshots[0], "to_date": snapshots[-1]}
+        publish_family(family, views, meta)
+    except Exception:
+        logger.exception("Static publish failed for family %s", family)
+        unpublish(family)
+
+
+def unpublish(family: str):
+    try:
+        _check_family(family)
+        os.remove(os.path.join(STATIC_DIR, family, "manifest.json"))
+    except FileNotFoundError:
+        pass
+    except Exception:
+        logger.exception("Could not remove stale manifest for family %s", family)
+
+
+def publish_family(family: str, views: Dict[str, Any], meta: Dict[str, Any] = None) -> str:
+    _check_family(family)
+
+    family_dir = os.path.join(STATIC_DIR, family)
+    os.makedirs(family_dir, exist_ok=True)
+
+    payloads = {
+        view: json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        for view, data in views.items()
+    }
+    h = hashlib.sha256()
+    for view in sorted(payloads):
+        h.update(view.encode("utf-8"))
+        h.update(payloads[view])
+    version = h.hexdigest()[:16]
+
+    version_dir = os.path.join(family_dir, version)
+    if not os.path.isdir(version_dir):
+        # rempli à côté puis renommé d'un coup -> jamais de version à moitié écrite
+        tmp_dir = tempfile.mkdtemp(dir=family_dir, prefix=".tmp-")
+        try:
+            for view, raw in payloads.items():
+                base = os.path.join(tmp_dir, f"{view}.json")
+                with open(base, "wb") as f:
+                    f.write(raw)
+                with open(base + ".gz", "wb") as f:
+                    f.write(gzip.compress(raw, 9, mtime=0))
+            os.chmod(tmp_dir, 0o755)
+            os.rename(tmp_dir, version_dir)
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+    manifest = {
+        "family": family,
+        "version": version,
+        "generated_at": datetime.utcnow().isoformat(),
+        "files": {view: f"{version}/{view}.json" for view in payloads},
+        **(meta or {}),
+    }
+    _write_atomic(
+        os.path.join(family_dir, "manifest.json"),
+        json.dumps(manifest, ensure_ascii=False, indent=2).encode("utf-8"),
+    )
+
+    _prune(family_dir, version)
+    return version
+
+
+def _prune(family_dir: str, current: str):
+    versions = [
+        e for e in os.scandir(family_dir)
+        if e.is_dir() and not e.name.startswith(".") and e.name != current
+    ]
+    versions.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+    for e in versions[KEEP_VERSIONS - 1:]:
+        shutil.rmtree(e.path, ignore_errors=True)
@@ -0,0 +1,67 @@
+# backend/api/singleflight.py
+import copy
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, Type
+
+class SingleFlightTimeout(Exception):
+    pass
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls sharing the same key: the first caller runs fn,
+    the others wait for it and get the same result (or a copy of its exception,
+    chained to the original; `passthrough` types are re-raised as is).
+    Nothing is cached once the call has finished.
+    """
+
+    def __init__(self, passthrough: Tuple[Type[BaseException], ...] = ()):
+        self.passthrough = passthrough
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any], timeout: float) -> Any:
+        # timeout : attente max (secondes) d'un suiveur, le leader n'est pas limité
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            if not call.done.wait(timeout):
+                raise SingleFlightTimeout(f"timed out after {timeout}s waiting for {key!r}")
+            if call.error is not None:
+                raise self._follower_error(call.error)
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+    def _follower_error(self, error: BaseException) -> BaseException:
+        # chaque suiveur lève sa propre instance : pas de __traceback__ partagé entre threads
+        if isinstance(error, self.passthrough):
+            return error
+        try:
+            err = copy.copy(error)
+        except Exception:
+            err = RuntimeError(f"single-flight leader failed: {error!r}")
+        err.__traceback__ = None
+        err.__cause__ = error
+        return err
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Rebuild members / weekly_points from the raw import archive (raw_imports + raw_blobs).
+
+Usage (from backend/, or /app in the container):
+  python -m scripts.replay_archive                       # every archived family
+  python -m scripts.replay_archive --family PandoraHearts --workers 8
+  python -m scripts.replay_archive --wipe                # drop the families' data first
+
+Notes:
+- Blobs are decompressed and parsed in parallel (process pool), then written in one
+  transaction, oldest snapshot first: the most recent gmbr wins for member fields.
+- Without --wipe, only the (family, snapshot_date) pairs present in the archive are
+  replaced; seeded history (seed_pandorahearts.sql) that was never archived is kept.
+- With --wipe, the replayed families' weekly_points are deleted first, then their
+  members that have no points left in another family (players who moved between
+  families keep their member row and their other families' history).
+- Each rebuilt family's static JSON (STATIC_DIR) is republished after the commit.
+- Members currently in a replayed family are overwritten from the archived gmbr:
+  manual nickname edits (PATCH .../nickname) are lost until re-applied. Members
+  now in a family that is not replayed are left untouched.
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+from sqlalchemy import insert, tuple_
+
+from api.archive import decompress
+from api.db import SessionLocal, engine
+from api.importer import parse_gmbr, parse_gexp
+from api.models import Base, Member, RawBlob, RawImport, WeeklyPoints
+from api.publish import publish_views
+
+BATCH_SIZE = 5000
+
+
+def _load(job):
+    family, snap, imported_at, gmbr_data, gexp_data = job
+    members = parse_gmbr(decompress(gmbr_data), family)
+    points = parse_gexp(decompress(gexp_data), members)
+    return family, snap, imported_at, members, points
+
+
+def replay(families: Optional[List[str]] = None, workers: Optional[int] = None, wipe: bool = False) -> None:
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        q = db.query(RawImport)
+        if families:
+            q = q.filter(RawImport.family.in_(families))
+        entries = q.order_by(RawImport.snapshot_date, RawImport.imported_at).all()
+        if not entries:
+            print("Nothing to replay.")
+            return
+
+        shas = {e.gmbr_sha256 for e in entries} | {e.gexp_sha256 for e in entries}
+        blobs = dict(db.query(RawBlob.sha256, RawBlob.data).filter(RawBlob.sha256.in_(shas)).all())
+
+        jobs = [
+            (e.family, e.snapshot_date, e.imported_at, blobs[e.gmbr_sha256], blobs[e.gexp_sha256])
+            for e in entries
+        ]
+
+        t0 = time.time()
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_load, jobs, chunksize=16))
+        print(f"Parsed {len(results)} snapshots in {time.time() - t0:.1f}s")
+
+        fams = sorted({r[0] for r in results})
+        if wipe:
+            db.query(WeeklyPoints).filter(WeeklyPoints.family.in_(fams)).delete(synchronize_session=False)
+            # les points d'autres familles (joueur transféré) ne sont pas rejoués -> on les garde
+            still_referenced = db.query(WeeklyPoints.player_id).filter(WeeklyPoints.player_id == Member.player_id)
+            db.query(Member).filter(
+                Member.family.in_(fams),
+                ~still_referenced.exists(),
+            ).delete(synchronize_session=False)
+        else:
+            pairs = [(r[0], r[1]) for r in results]
+            for i in range(0, len(pairs), BATCH_SIZE):
+                db.query(WeeklyPoints).filter(
+                    tuple_(WeeklyPoints.family, WeeklyPoints.snapshot_date).in_(pairs[i:i + BATCH_SIZE])
+                ).delete(synchronize_session=False)
+
+        # members: dernier snapshot gagnant
+        final_members = {}
+        for _, _, _, members, _ in results:
+            final_members.update(members)
+
+        existing = {
+            m.player_id: m
+            for m in db.query(Member).filter(Member.player_id.in_(list(final_members)))
+        }
+        for pid, m in final_members.items():
+            if pid not in existing:
+                db.add(Member(**m))
+            elif existing[pid].family in fams:
+                for k, v in m.items():
+                    setattr(existing[pid], k, v)
+            # sinon : joueur passé dans une famille non rejouée -> sa fiche actuelle fait foi
+        db.flush()
+
+        rows = [
+            {
+                "snapshot_date": snap,
+                "imported_at": imported_at,
+                "family": family,
+                "player_id": pid,
+                "gexp_points": pts,
+            }
+            for family, snap, imported_at, _, points in results
+            for pid, pts in points.items()
+        ]
+        for i in range(0, len(rows), BATCH_SIZE):
+            db.execute(insert(WeeklyPoints), rows[i:i + BATCH_SIZE])
+
+        db.commit()
+        print(
+            f"Replayed {len(results)} snapshots for {', '.join(fams)}: "
+            f"{len(final_members)} members, {len(rows)} weekly_points in {time.time() - t0:.1f}s"
+        )
+
+        # JSON statiques : sinon les dashboards restent sur les données d'avant le replay
+        for family in fams:
+            publish_views(db, family)
+    finally:
+        db.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild members/weekly_points from the raw import archive")
+    parser.add_argument("--family", action="append", help="family to replay (repeatable, default: all)")
+    parser.add_argument("--workers", type=int, default=None, help="parser processes (default: CPU count)")
+    parser.add_argument("--wipe", action="store_true", help="delete the families' weekly_points (and orphaned members) first")
+    args = parser.parse_args()
+    replay(args.family, args.workers, args.wipe)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,6 @@
+# backend/tests/conftest.py
+import os
+import sys
+
+# api/ et scripts/ sont importés depuis backend/ (comme dans le conteneur /app)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,62 @@
+# backend/tests/test_publish.py
+import json
+from datetime import date, datetime
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from sqlalchemy import Integer, create_engine
+from sqlalchemy.orm import sessionmaker
+
+from api import crud, publish
+from api.models import Base, Member, WeeklyPoints
+
+FAMILY = "PandoraHearts"
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(WeeklyPoints.__table__.c.id, "type", Integer())
+    monkeypatch.setattr(publish, "STATIC_DIR", str(tmp_path / "static"))
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'publish.db'}")
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine, autoflush=False)()
+    session.add(Member(player_id=1, account_id=10, nickname="Droken", level=99, class_id=2, family=FAMILY))
+    session.flush()
+    for snap, pts in ((date(2025, 1, 5), 100), (date(2025, 1, 12), 250)):
+        session.add(WeeklyPoints(snapshot_date=snap, imported_at=datetime(2025, 1, 12), family=FAMILY, player_id=1, gexp_points=pts))
+    session.commit()
+    yield session
+    session.close()
+
+
+def _manifest_path():
+    return f"{publish.STATIC_DIR}/{FAMILY}/manifest.json"
+
+
+def test_publish_views_writes_default_views(db):
+    publish.publish_views(db, FAMILY)
+
+    with open(_manifest_path()) as f:
+        manifest = json.load(f)
+    assert set(manifest["files"]) == {"latest", "snapshots", "history"}
+    assert manifest["history_range"] == {"from_date": "2025-01-05", "to_date": "2025-01-12"}
+
+    with open(f"{publish.STATIC_DIR}/{FAMILY}/{manifest['files']['history']}") as f:
+        history = json.load(f)
+    assert history["players"][0]["period_diff"] == 150
+
+
+def test_failed_publish_removes_stale_manifest(db, monkeypatch):
+    publish.publish_views(db, FAMILY)
+
+    def boom(*args):
+        raise RuntimeError("db down")
+
+    monkeypatch.setattr(crud, "get_history", boom)
+    publish.publish_views(db, FAMILY)
+
+    with pytest.raises(FileNotFoundError):
+        open(_manifest_path())
@@ -0,0 +1,79 @@
+# backend/tests/test_replay_archive.py
+import json
+from datetime import date, datetime
+
+import pytest
+
+sqlalchemy = pytest.importorskip("sqlalchemy")
+pytest.importorskip("psycopg2")  # api.db crée le moteur postgres à l'import
+
+from sqlalchemy import Integer, create_engine
+from sqlalchemy.orm import sessionmaker
+
+from api import publish
+from api.archive import store_import
+from api.models import Base, Member, RawImport, WeeklyPoints
+from scripts import replay_archive
+
+A, B = "FamilyA", "FamilyB"
+SNAP = date(2025, 1, 5)
+GMBR_A = "gmbr 1|10|OldNick|99|1|3|0|0|0|0 2|20|Stay|99|2|3|0|0|0|0"
+GEXP_A = "gexp 1|100 2|200"
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    # sqlite n'auto-incrémente que les INTEGER PRIMARY KEY
+    for table in (WeeklyPoints.__table__, RawImport.__table__):
+        monkeypatch.setattr(table.c.id, "type", Integer())
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'replay.db'}")
+    Session = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+    Base.metadata.create_all(bind=engine)
+    monkeypatch.setattr(replay_archive, "engine", engine)
+    monkeypatch.setattr(replay_archive, "SessionLocal", Session)
+    monkeypatch.setattr(publish, "STATIC_DIR", str(tmp_path / "static"))
+
+    session = Session()
+    # snapshot archivé de A : le joueur 1 y était encore
+    store_import(session, A, SNAP, datetime(2025, 1, 5, 12), GMBR_A, GEXP_A)
+    # depuis : joueur 1 passé dans B (historique B seedé, jamais archivé), pseudo changé
+    session.add(Member(player_id=1, account_id=10, nickname="NewNick", level=99, class_id=1, family=B))
+    session.add(Member(player_id=2, account_id=20, nickname="Renamed", level=99, class_id=2, family=A))
+    session.flush()
+    session.add(WeeklyPoints(snapshot_date=date(2025, 2, 2), imported_at=datetime(2025, 2, 2), family=B, player_id=1, gexp_points=500))
+    session.commit()
+    yield session
+    session.close()
+
+
+@pytest.mark.parametrize("wipe", [False, True])
+def test_replay_one_family_keeps_moved_player_in_other_family(db, wipe):
+    replay_archive.replay([A], workers=1, wipe=wipe)
+    db.expire_all()
+
+    moved = db.get(Member, 1)
+    assert (moved.family, moved.nickname) == (B, "NewNick")
+
+    stayed = db.get(Member, 2)
+    assert (stayed.family, stayed.nickname) == (A, "Stay")
+
+    points = {
+        (w.family, w.player_id, w.snapshot_date): w.gexp_points
+        for w in db.query(WeeklyPoints)
+    }
+    assert points == {
+        (A, 1, SNAP): 100,
+        (A, 2, SNAP): 200,
+        (B, 1, date(2025, 2, 2)): 500,
+    }
+
+
+def test_replay_republishes_rebuilt_families(db):
+    replay_archive.replay([A], workers=1)
+
+    with open(f"{publish.STATIC_DIR}/{A}/manifest.json") as f:
+        manifest = json.load(f)
+    with open(f"{publish.STATIC_DIR}/{A}/{manifest['files']['latest']}") as f:
+        latest = json.load(f)
+    assert [(p["nickname"], p["gexp_points"]) for p in latest] == [("Stay", 200), ("NewNick", 100)]
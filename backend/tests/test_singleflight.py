@@ -0,0 +1,134 @@
+# backend/tests/test_singleflight.py
+import threading
+import time
+
+import pytest
+
+from api.singleflight import SingleFlight, SingleFlightTimeout
+
+
+class PassThrough(Exception):
+    pass
+
+
+def _run_concurrently(sf, key, fn, n, timeout=5):
+    results, errors = [], []
+    start = threading.Barrier(n)
+
+    def worker():
+        start.wait()
+        try:
+            results.append(sf.do(key, fn, timeout))
+        except BaseException as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results, errors
+
+
+def test_one_leader_runs_and_followers_share_result():
+    sf = SingleFlight()
+    calls = []
+
+    def fn():
+        calls.append(1)
+        time.sleep(0.2)
+        return {"players": []}
+
+    results, errors = _run_concurrently(sf, ("history", "F"), fn, 10)
+
+    assert len(calls) == 1
+    assert errors == []
+    assert len(results) == 10
+    assert all(r is results[0] for r in results)
+
+
+def test_nothing_is_cached_after_completion():
+    sf = SingleFlight()
+    calls = []
+    sf.do("k", lambda: calls.append(1), 1)
+    sf.do("k", lambda: calls.append(1), 1)
+    assert len(calls) == 2
+
+
+def test_followers_get_their_own_copy_of_the_error():
+    sf = SingleFlight()
+
+    def fn():
+        time.sleep(0.2)
+        raise ValueError("boom")
+
+    results, errors = _run_concurrently(sf, "k", fn, 5)
+
+    assert results == []
+    assert len(errors) == 5
+    assert all(isinstance(e, ValueError) and e.args == ("boom",) for e in errors)
+    assert len({id(e) for e in errors}) == 5
+    leader = [e for e in errors if e.__cause__ is None]
+    assert len(leader) == 1
+    assert all(e.__cause__ is leader[0] for e in errors if e is not leader[0])
+
+
+def test_passthrough_errors_are_reraised_as_is():
+    sf = SingleFlight(passthrough=(PassThrough,))
+
+    def fn():
+        time.sleep(0.2)
+        raise PassThrough(404)
+
+    _, errors = _run_concurrently(sf, "k", fn, 5)
+
+    assert len(errors) == 5
+    assert all(e is errors[0] for e in errors)
+
+
+def test_http_exception_passthrough():
+    fastapi = pytest.importorskip("fastapi")
+    sf = SingleFlight(passthrough=(fastapi.HTTPException,))
+
+    def fn():
+        time.sleep(0.2)
+        raise fastapi.HTTPException(status_code=404, detail="Player not found")
+
+    _, errors = _run_concurrently(sf, "k", fn, 3)
+
+    assert all(e is errors[0] and e.status_code == 404 for e in errors)
+
+
+def test_follower_times_out_while_leader_keeps_running():
+    sf = SingleFlight()
+    release = threading.Event()
+    leader_result = []
+
+    leader = threading.Thread(target=lambda: leader_result.append(sf.do("k", release.wait, 5)))
+    leader.start()
+    time.sleep(0.05)
+
+    with pytest.raises(SingleFlightTimeout):
+        sf.do("k", lambda: None, 0.1)
+
+    release.set()
+    leader.join()
+    assert leader_result == [True]
+
+
+def test_coalesce_maps_follower_timeout_to_503():
+    fastapi = pytest.importorskip("fastapi")
+    pytest.importorskip("psycopg2")
+    from api import main
+
+    release = threading.Event()
+    leader = threading.Thread(target=lambda: main._coalesce("k", release.wait, 5))
+    leader.start()
+    time.sleep(0.05)
+
+    with pytest.raises(fastapi.HTTPException) as exc:
+        main._coalesce("k", lambda: None, 0.1)
+    assert exc.value.status_code == 503
+
+    release.set()
+    leader.join()
@@ -2,3 +2,38 @@
 export const API_BASE =
   (import.meta?.env?.VITE_API_BASE && import.meta.env.VITE_API_BASE) ||
   "https://api.pandorahearts-family.fr";
+
+
+// JSON pré-calculés publiés à chaque import (servis par nginx, cf. backend/api/publish.py)
+export const STATIC_BASE =
+  (import.meta?.env?.VITE_STATIC_BASE && import.meta.env.VITE_STATIC_BASE) || "";
+
+const MANIFEST_TTL_MS = 60_000;
+const manifests = new Map(); // family -> { at, promise }
+
+// Renvoie la vue publiée (latest, snapshots, history) ou null -> l'appelant retombe sur l'API
+export async function fetchPublished(family, view) {
+  if (!STATIC_BASE) return null;
+  const base = `${STATIC_BASE}/${encodeURIComponent(family)}`;
+
+  try {
+    const cached = manifests.get(family);
+    if (!cached || Date.now() - cached.at > MANIFEST_TTL_MS) {
+      manifests.set(family, {
+        at: Date.now(),
+        promise: fetch(`${base}/manifest.json`, { cache: "no-cache" }).then((r) =>
+          r.ok ? r.json() : null
+        ),
+      });
+    }
+    const manifest = await manifests.get(family).promise;
+    const file = manifest?.files?.[view];
+    if (!file) return null;
+
+    const res = await fetch(`${base}/${file}`);
+    return res.ok ? await res.json() : null;
+  } catch (e) {
+    manifests.delete(family);
+    return null;
+  }
+}
@@ -1,6 +1,6 @@
 // frontend/src/pages/Dashboard.jsx
 import React, { useEffect, useMemo, useState } from "react";
-import { API_BASE } from "../api";
+import { API_BASE, fetchPublished } from "../api";
 import Leaderboard from "../components/Leaderboard";
 import { CLASS_NAMES, CLASS_ICONS } from "../constants/classes";
 
@@ -16,8 +16,12 @@ export default function Dashboard() {
 
   const loadLatest = () => {
     setLoading(true);
-    fetch(`${API_BASE}/family/${encodeURIComponent(FAMILY)}/latest`)
-      .then((res) => res.json())
+    fetchPublished(FAMILY, "latest")
+      .then(
+        (published) =>
+          published ??
+          fetch(`${API_BASE}/family/${encodeURIComponent(FAMILY)}/latest`).then((res) => res.json())
+      )
       .then((data) => {
         setMembers(Array.isArray(data) ? data : []);
         setLoading(false);
@@ -1,6 +1,6 @@
 // frontend/src/pages/HistoryDashboard.jsx
 import React, { useEffect, useMemo, useState } from "react";
-import { API_BASE } from "../api";
+import { API_BASE, fetchPublished } from "../api";
 import { CLASS_NAMES, CLASS_ICONS } from "../constants/classes";
 import { Link } from "react-router-dom";
 
@@ -20,8 +20,11 @@ export default function HistoryDashboard() {
 
   // Load available snapshot dates
   useEffect(() => {
-    fetch(`${API_BASE}/family/${family}/snapshots`)
-      .then((r) => r.json())
+    fetchPublished(family, "snapshots")
+      .then(
+        (published) =>
+          published ?? fetch(`${API_BASE}/family/${family}/snapshots`).then((r) => r.json())
+      )
       .then((dates) => {
         if (!Array.isArray(dates)) {
           console.error("Snapshots API returned:", dates);
@@ -46,10 +49,18 @@ export default function HistoryDashboard() {
     if (!fromDate || !toDate) return;
 
     setLoading(true);
-    fetch(
-      `${API_BASE}/family/${family}/history?from_date=${fromDate}&to_date=${toDate}`
-    )
-      .then((r) => r.json())
+    // plage par défaut (tous les snapshots) -> JSON pré-calculé, sinon API
+    const isDefaultRange =
+      snapshots.length > 0 && fromDate === snapshots[0] && toDate === snapshots[snapshots.length - 1];
+
+    (isDefaultRange ? fetchPublished(family, "history") : Promise.resolve(null))
+      .then((published) => {
+        const d = published?.dates;
+        if (d?.length && d[0] === fromDate && d[d.length - 1] === toDate) return published;
+        return fetch(
+          `${API_BASE}/family/${family}/history?from_date=${fromDate}&to_date=${toDate}`
+        ).then((r) => r.json());
+      })
       .then((json) => {
         if (!json || !Array.isArray(json.players) || !Array.isArray(json.dates)) {
           console.error("History API error:", json);